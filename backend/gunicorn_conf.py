@@ -0,0 +1,11 @@
+# gunicorn_conf.py
+# Run with: gunicorn main:app -c gunicorn_conf.py
+import os
+
+# Default to a single worker: users/sessions/todos live in process
+# memory, so independent workers would each hold their own data. Once
+# storage moves to a shared backend (e.g. Redis or SQLite), opt in to
+# multi-core scaling with WEB_CONCURRENCY=2n+1 (n = CPU count).
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = os.environ.get("BIND", "0.0.0.0:8000")
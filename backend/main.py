@@ -1,16 +1,25 @@
 # main.py
 from datetime import datetime, timezone
-from typing import List, Optional, Dict
-from fastapi import FastAPI, HTTPException, status, Depends
+from typing import Annotated, Optional, Dict
+from fastapi import FastAPI, HTTPException, Request, Response, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, Field, field_validator, EmailStr
-from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, field_validator
+from fastapi.responses import ORJSONResponse
+import msgspec
 import secrets
 import hashlib
+import hmac
+import re
+import sys
+import time
 from fastapi.middleware.cors import CORSMiddleware
 
 
-app = FastAPI(title="TODO API with Auth", version="1.0.0")
+app = FastAPI(
+    title="TODO API with Auth",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 security = HTTPBearer()
 
 app.add_middleware(
@@ -26,23 +35,74 @@ def read_root():
     return {"status": "healthy"}
     
 # In-memory storage
-user_todos: Dict[int, Dict] = {}  # {user_id: {todo_id: todo_data}}
+user_todos: Dict[int, Dict] = {}  # {user_id: {"items": [todo_data], "by_id": {todo_id: index}}}
 users_db: Dict[str, Dict] = {}    # {username: user_data}
+users_by_id: Dict[int, Dict] = {} # {user_id: user_data}
 sessions: Dict[str, int] = {}     # {token: user_id}
 
 current_user_id = 1
 current_todo_id: Dict[int, int] = {}  # {user_id: next_todo_id}
 
-# Password hashing
+# Canonical todo field names, interned once so every stored dict shares
+# the same key objects and key lookups compare by pointer
+(_F_ID, _F_USER_ID, _F_TITLE, _F_DESCRIPTION,
+ _F_DUE_DATE, _F_PRIORITY, _F_COMPLETED, _F_CREATED_AT) = map(
+    sys.intern,
+    ("id", "user_id", "title", "description",
+     "due_date", "priority", "completed", "created_at")
+)
+
+# Timestamps: cache the formatted ISO string per second so back-to-back
+# writes skip rebuilding a timezone-aware datetime each time
+_now_cache = (0, "")
+
+def now_iso() -> str:
+    global _now_cache
+    sec = int(time.time())
+    if sec != _now_cache[0]:
+        _now_cache = (sec, datetime.fromtimestamp(sec, timezone.utc).isoformat())
+    return _now_cache[1]
+
+# Password hashing (PBKDF2-SHA256, single-shot C implementation)
+_PBKDF2_ITERATIONS = 100_000
+_SALT_BYTES = 16
+
 def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+    salt = secrets.token_bytes(_SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, _PBKDF2_ITERATIONS)
+    return (salt + digest).hex()
+
+def verify_password(password: str, stored: str) -> bool:
+    raw = bytes.fromhex(stored)
+    salt, digest = raw[:_SALT_BYTES], raw[_SALT_BYTES:]
+    candidate = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, _PBKDF2_ITERATIONS)
+    return hmac.compare_digest(candidate, digest)
+
+# Session tokens: one-shot hmac.digest over user id + nonce, signed with a
+# per-process key. Tokens still live in `sessions` so logout can revoke them.
+SECRET_KEY = secrets.token_bytes(32)
+
+def make_session_token(user_id: int) -> str:
+    nonce = secrets.token_hex(16)
+    return hmac.digest(SECRET_KEY, f"{user_id}:{nonce}".encode(), 'sha256').hex()
+
+# Cheap pre-compiled email check — enough for this app's needs without
+# pulling in email-validator's multi-step parser
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
 # Authentication models
 class UserRegister(BaseModel):
     username: str = Field(..., min_length=3, max_length=50)
-    email: EmailStr
+    email: str
     password: str = Field(..., min_length=6)
 
+    @field_validator('email')
+    @classmethod
+    def validate_email(cls, v: str) -> str:
+        if not _EMAIL_RE.match(v):
+            raise ValueError('Invalid email address')
+        return v
+
 class UserLogin(BaseModel):
     username: str
     password: str
@@ -50,37 +110,52 @@ class UserLogin(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    id: Optional[int] = None
+    username: Optional[str] = None
+    email: Optional[str] = None
 
-# TODO models
-class TodoBase(BaseModel):
-    title: str = Field(..., min_length=1, max_length=100)
-    description: Optional[str] = Field(None, max_length=500)
+# TODO models (msgspec Structs — C-speed decode + validation on the write path)
+class TodoBase(msgspec.Struct):
+    title: Annotated[str, msgspec.Meta(min_length=1, max_length=100)]
+    description: Optional[Annotated[str, msgspec.Meta(max_length=500)]] = None
     due_date: Optional[str] = None
-    priority: int = Field(default=3, ge=1, le=5)
-    completed: bool = Field(default=False)
-    
-    @field_validator('title')
-    @classmethod
-    def validate_title(cls, v: str) -> str:
-        trimmed = v.strip()
+    priority: Annotated[int, msgspec.Meta(ge=1, le=5)] = 3
+    completed: bool = False
+
+    def __post_init__(self):
+        trimmed = self.title.strip()
         if not trimmed:
             raise ValueError('Title cannot be empty or just whitespace')
-        return trimmed
+        self.title = trimmed
 
 class TodoCreate(TodoBase):
     pass
 
-class TodoUpdate(BaseModel):
-    title: Optional[str] = Field(None, min_length=1, max_length=100)
-    description: Optional[str] = Field(None, max_length=500)
+class TodoUpdate(msgspec.Struct):
+    title: Optional[Annotated[str, msgspec.Meta(min_length=1, max_length=100)]] = None
+    description: Optional[Annotated[str, msgspec.Meta(max_length=500)]] = None
     due_date: Optional[str] = None
-    priority: Optional[int] = Field(None, ge=1, le=5)
+    priority: Optional[Annotated[int, msgspec.Meta(ge=1, le=5)]] = None
     completed: Optional[bool] = None
 
-class TodoResponse(TodoBase):
-    id: int
-    user_id: int
-    created_at: str
+# One decoder per model, built once at import time
+_todo_create_decoder = msgspec.json.Decoder(TodoCreate)
+_todo_update_decoder = msgspec.json.Decoder(TodoUpdate)
+_json_encoder = msgspec.json.Encoder()
+
+def decode_body(decoder: msgspec.json.Decoder, body: bytes):
+    try:
+        return decoder.decode(body)
+    except msgspec.ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except msgspec.DecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid JSON body"
+        )
 
 # Authentication dependency
 async def get_current_user(token: HTTPAuthorizationCredentials = Depends(security)):
@@ -91,21 +166,43 @@ async def get_current_user(token: HTTPAuthorizationCredentials = Depends(securit
         )
     
     user_id = sessions[token.credentials]
-    if user_id not in [user['id'] for user in users_db.values()]:
+    user = users_by_id.get(user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+
+    return {"id": user["id"], "username": user["username"]}
+
+# Combined auth + todo-store dependency for the todo endpoints.
+# Resolves token, user and the user's todo dict in one place so each
+# endpoint pays a single dependency call instead of two helper hops.
+async def get_user_context(token: HTTPAuthorizationCredentials = Depends(security)):
+    user_id = sessions.get(token.credentials)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token"
+        )
+
+    if user_id not in users_by_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
-    
-    return {"id": user_id, "username": next((u['username'] for u in users_db.values() if u['id'] == user_id), None)}
 
-# Get user-specific todos
-def get_user_todos(user_id: int):
-    if user_id not in user_todos:
-        user_todos[user_id] = {}
-    if user_id not in current_todo_id:
-        current_todo_id[user_id] = 1
-    return user_todos[user_id], current_todo_id[user_id]
+    return user_id, user_todos.setdefault(user_id, {"items": [], "by_id": {}})
+
+# Resolve a todo id to its index in the store's items list
+def get_todo_index(store: Dict, todo_id: int) -> int:
+    idx = store["by_id"].get(todo_id)
+    if idx is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"TODO with id {todo_id} not found"
+        )
+    return idx
 
 # ========== AUTHENTICATION ENDPOINTS ==========
 @app.post("/register", response_model=Token)
@@ -125,22 +222,29 @@ async def register(user: UserRegister):
         "username": user.username,
         "email": user.email,
         "password": hash_password(user.password),
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": now_iso()
     }
     
     users_db[user.username] = user_data
-    
+    users_by_id[current_user_id] = user_data
+
     # Generate token
-    token = secrets.token_hex(32)
+    token = make_session_token(current_user_id)
     sessions[token] = current_user_id
     
     # Initialize user's todos
-    user_todos[current_user_id] = {}
+    user_todos[current_user_id] = {"items": [], "by_id": {}}
     current_todo_id[current_user_id] = 1
     
     current_user_id += 1
-    
-    return {"access_token": token, "token_type": "bearer"}
+
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "id": user_data["id"],
+        "username": user_data["username"],
+        "email": user_data["email"]
+    }
 
 @app.post("/login", response_model=Token)
 async def login(user: UserLogin):
@@ -154,17 +258,23 @@ async def login(user: UserLogin):
     stored_user = users_db[user.username]
     
     # Verify password
-    if stored_user["password"] != hash_password(user.password):
+    if not verify_password(user.password, stored_user["password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
     
     # Generate new token
-    token = secrets.token_hex(32)
+    token = make_session_token(stored_user["id"])
     sessions[token] = stored_user["id"]
-    
-    return {"access_token": token, "token_type": "bearer"}
+
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "id": stored_user["id"],
+        "username": stored_user["username"],
+        "email": stored_user["email"]
+    }
 
 @app.post("/logout")
 async def logout(token: HTTPAuthorizationCredentials = Depends(security)):
@@ -191,143 +301,125 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
 async def root():
     return {"message": "TODO API with Authentication", "status": "healthy"}
 
-@app.post("/todos", response_model=TodoResponse, status_code=status.HTTP_201_CREATED)
+@app.post("/todos", status_code=status.HTTP_201_CREATED)
 async def create_todo(
-    todo: TodoCreate,
-    current_user: dict = Depends(get_current_user)
+    request: Request,
+    ctx: tuple = Depends(get_user_context)
 ):
     """Create a new TODO item"""
-    user_id = current_user["id"]
-    todos, next_id = get_user_todos(user_id)
-    
+    todo = decode_body(_todo_create_decoder, await request.body())
+    user_id, store = ctx
+    next_id = current_todo_id.setdefault(user_id, 1)
+
     new_todo = {
-        "id": next_id,
-        "user_id": user_id,
-        "title": todo.title,
-        "description": todo.description,
-        "due_date": todo.due_date,
-        "priority": todo.priority,
-        "completed": todo.completed,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        _F_ID: next_id,
+        _F_USER_ID: user_id,
+        _F_TITLE: todo.title,
+        _F_DESCRIPTION: todo.description,
+        _F_DUE_DATE: todo.due_date,
+        _F_PRIORITY: todo.priority,
+        _F_COMPLETED: todo.completed,
+        _F_CREATED_AT: now_iso()
     }
-    
-    todos[next_id] = new_todo
+
+    store["by_id"][next_id] = len(store["items"])
+    store["items"].append(new_todo)
     current_todo_id[user_id] = next_id + 1
-    
+
     return new_todo
 
-@app.get("/todos", response_model=List[TodoResponse])
-async def list_todos(current_user: dict = Depends(get_current_user)):
+@app.get("/todos")
+async def list_todos(ctx: tuple = Depends(get_user_context)):
     """List all TODO items for current user"""
-    user_id = current_user["id"]
-    todos, _ = get_user_todos(user_id)
-    return list(todos.values())
+    user_id, store = ctx
+    return Response(
+        content=_json_encoder.encode(store["items"]),
+        media_type="application/json"
+    )
 
-@app.get("/todos/{todo_id}", response_model=TodoResponse)
+@app.get("/todos/{todo_id}")
 async def get_todo(
     todo_id: int,
-    current_user: dict = Depends(get_current_user)
+    ctx: tuple = Depends(get_user_context)
 ):
     """Get a specific TODO item"""
-    user_id = current_user["id"]
-    todos, _ = get_user_todos(user_id)
-    
-    if todo_id not in todos:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"TODO with id {todo_id} not found"
-        )
-    
-    return todos[todo_id]
+    user_id, store = ctx
+    idx = get_todo_index(store, todo_id)
+    return store["items"][idx]
 
-@app.put("/todos/{todo_id}", response_model=TodoResponse)
+@app.put("/todos/{todo_id}")
 async def replace_todo(
     todo_id: int,
-    todo: TodoCreate,
-    current_user: dict = Depends(get_current_user)
+    request: Request,
+    ctx: tuple = Depends(get_user_context)
 ):
     """Replace an entire TODO item"""
-    user_id = current_user["id"]
-    todos, _ = get_user_todos(user_id)
-    
-    if todo_id not in todos:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"TODO with id {todo_id} not found"
-        )
-    
+    todo = decode_body(_todo_create_decoder, await request.body())
+    user_id, store = ctx
+    idx = get_todo_index(store, todo_id)
+
     updated_todo = {
-        "id": todo_id,
-        "user_id": user_id,
-        "title": todo.title,
-        "description": todo.description,
-        "due_date": todo.due_date,
-        "priority": todo.priority,
-        "completed": todo.completed,
-        "created_at": todos[todo_id]["created_at"]
+        _F_ID: todo_id,
+        _F_USER_ID: user_id,
+        _F_TITLE: todo.title,
+        _F_DESCRIPTION: todo.description,
+        _F_DUE_DATE: todo.due_date,
+        _F_PRIORITY: todo.priority,
+        _F_COMPLETED: todo.completed,
+        _F_CREATED_AT: store["items"][idx][_F_CREATED_AT]
     }
-    
-    todos[todo_id] = updated_todo
+
+    store["items"][idx] = updated_todo
     return updated_todo
 
-@app.patch("/todos/{todo_id}", response_model=TodoResponse)
+@app.patch("/todos/{todo_id}")
 async def update_todo(
     todo_id: int,
-    todo_update: TodoUpdate,
-    current_user: dict = Depends(get_current_user)
+    request: Request,
+    ctx: tuple = Depends(get_user_context)
 ):
     """Partially update a TODO item"""
-    user_id = current_user["id"]
-    todos, _ = get_user_todos(user_id)
-    
-    if todo_id not in todos:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"TODO with id {todo_id} not found"
-        )
-    
-    current_todo = todos[todo_id].copy()
-    
-    update_data = todo_update.model_dump(exclude_unset=True)
+    todo_update = decode_body(_todo_update_decoder, await request.body())
+    user_id, store = ctx
+    idx = get_todo_index(store, todo_id)
+
+    # No await between read and write, so in-place mutation is safe
+    current_todo = store["items"][idx]
+
+    update_data = msgspec.structs.asdict(todo_update)
     for field, value in update_data.items():
         if value is not None:
             current_todo[field] = value
-    
-    todos[todo_id] = current_todo
+
     return current_todo
 
-@app.patch("/todos/{todo_id}/toggle", response_model=TodoResponse)
+@app.patch("/todos/{todo_id}/toggle")
 async def toggle_todo_status(
     todo_id: int,
-    current_user: dict = Depends(get_current_user)
+    ctx: tuple = Depends(get_user_context)
 ):
     """Toggle the completed status"""
-    user_id = current_user["id"]
-    todos, _ = get_user_todos(user_id)
-    
-    if todo_id not in todos:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"TODO with id {todo_id} not found"
-        )
-    
-    todos[todo_id]["completed"] = not todos[todo_id]["completed"]
-    return todos[todo_id]
+    user_id, store = ctx
+    idx = get_todo_index(store, todo_id)
+
+    todo = store["items"][idx]
+    todo["completed"] = not todo["completed"]
+    return todo
 
 @app.delete("/todos/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_todo(
     todo_id: int,
-    current_user: dict = Depends(get_current_user)
+    ctx: tuple = Depends(get_user_context)
 ):
     """Delete a TODO item"""
-    user_id = current_user["id"]
-    todos, _ = get_user_todos(user_id)
-    
-    if todo_id not in todos:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"TODO with id {todo_id} not found"
-        )
-    
-    del todos[todo_id]
+    user_id, store = ctx
+    idx = get_todo_index(store, todo_id)
+
+    # Swap-with-last keeps the delete O(1)
+    items, by_id = store["items"], store["by_id"]
+    last = items.pop()
+    if idx < len(items):
+        items[idx] = last
+        by_id[last["id"]] = idx
+    del by_id[todo_id]
     return None
@@ -0,0 +1,21 @@
+# setup.py
+# Optional AOT build: compile main.py to a C extension with Cython.
+#   pip install cython
+#   python setup.py build_ext --inplace
+# uvicorn/gunicorn then import the built main.*.so transparently; remove
+# the .so to fall back to the interpreted module.
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="todosecure-backend",
+    ext_modules=cythonize(
+        ["main.py"],
+        language_level=3,
+        # Cython's annotation typing rejects builtin-typed parameters whose
+        # default is a FastAPI Depends(...) marker (e.g. `current_user: dict
+        # = Depends(...)`), crashing at module init — keep annotations as
+        # plain objects like CPython does
+        compiler_directives={"annotation_typing": False},
+    ),
+)
@@ -1,7 +1,9 @@
 # todo_gui.py
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
+import heapq
 import time
 import json
 
@@ -23,6 +25,14 @@ if 'username' not in st.session_state:
     st.session_state.username = None
 if 'user_id' not in st.session_state:
     st.session_state.user_id = None
+if 'http' not in st.session_state:
+    # One pooled session per browser session: keep-alive connections are
+    # reused across the multiple API calls fired on every Streamlit rerun
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    st.session_state.http = session
 
 # Helper function for API calls
 def make_api_call(method, endpoint, data=None, require_auth=True):
@@ -34,34 +44,54 @@ def make_api_call(method, endpoint, data=None, require_auth=True):
         if require_auth and st.session_state.token:
             headers["Authorization"] = f"Bearer {st.session_state.token}"
         
-        if method == "GET":
-            response = requests.get(url, headers=headers)
-        elif method == "POST":
-            response = requests.post(url, json=data, headers=headers)
-        elif method == "PUT":
-            response = requests.put(url, json=data, headers=headers)
-        elif method == "PATCH":
-            response = requests.patch(url, json=data, headers=headers)
-        elif method == "DELETE":
-            response = requests.delete(url, headers=headers)
-        
-        response.raise_for_status()
+        response = st.session_state.http.request(
+            method, url, json=data, headers=headers, timeout=5
+        )
+
+        # Explicit status check: error responses are expected (bad login,
+        # missing todo), no need to pay for exception construction
+        if response.status_code >= 400:
+            try:
+                error_msg = response.json().get('detail', response.reason)
+            except:
+                error_msg = response.reason
+            st.error(f"❌ Error: {error_msg}")
+            return None
+
         return response.json() if response.content else {"message": "Success"}
-        
+
     except requests.exceptions.ConnectionError:
         st.error("❌ Server connection failed. Start server: uvicorn main:app --reload")
         return None
-    except requests.exceptions.HTTPError as e:
-        try:
-            error_msg = e.response.json().get('detail', str(e))
-        except:
-            error_msg = str(e)
-        st.error(f"❌ Error: {error_msg}")
+    except requests.exceptions.Timeout:
+        st.error("❌ Request timed out. Please try again.")
         return None
     except Exception as e:
         st.error(f"❌ Unexpected error: {str(e)}")
         return None
 
+# Cached reads: Streamlit reruns the whole script on every interaction,
+# so idempotent GETs are cached briefly; mutations clear the cache below
+@st.cache_data(ttl=5, show_spinner=False)
+def fetch_todos(token):
+    return make_api_call("GET", "/todos")
+
+@st.cache_data(ttl=5, show_spinner=False)
+def fetch_me(token):
+    return make_api_call("GET", "/me")
+
+# Aggregate dashboard counts in one pass over the todo list
+def todo_stats(todos):
+    """Return (total, completed, high_priority) counts"""
+    completed = 0
+    high_priority = 0
+    for t in todos:
+        if t.get('completed', False):
+            completed += 1
+        if t.get('priority', 3) == 1:
+            high_priority += 1
+    return len(todos), completed, high_priority
+
 # Authentication Page
 def show_auth_page():
     """Show login/register page"""
@@ -70,7 +100,7 @@ def show_auth_page():
     
     # Check server
     try:
-        health = requests.get(f"{API_URL}/", timeout=3)
+        health = st.session_state.http.get(f"{API_URL}/", timeout=3)
         if health.status_code != 200:
             st.error("⚠️ Server not responding. Start with: `uvicorn main:app --reload`")
             return
@@ -97,14 +127,11 @@ def show_auth_page():
                         result = make_api_call("POST", "/login", data, require_auth=False)
                         
                         if result and "access_token" in result:
+                            # Login response already carries the user info
                             st.session_state.token = result["access_token"]
-                            st.session_state.username = username
-                            
-                            # Get user info
-                            user_info = make_api_call("GET", "/me")
-                            if user_info:
-                                st.session_state.user_id = user_info.get("id")
-                            
+                            st.session_state.username = result.get("username", username)
+                            st.session_state.user_id = result.get("id")
+
                             st.success(f"✅ Welcome back, {username}!")
                             time.sleep(1)
                             st.rerun()
@@ -138,14 +165,11 @@ def show_auth_page():
                         result = make_api_call("POST", "/register", data, require_auth=False)
                         
                         if result and "access_token" in result:
+                            # Register response already carries the user info
                             st.session_state.token = result["access_token"]
-                            st.session_state.username = username
-                            
-                            # Get user info
-                            user_info = make_api_call("GET", "/me")
-                            if user_info:
-                                st.session_state.user_id = user_info.get("id")
-                            
+                            st.session_state.username = result.get("username", username)
+                            st.session_state.user_id = result.get("id")
+
                             st.success(f"✅ Account created! Welcome, {username}!")
                             time.sleep(1)
                             st.rerun()
@@ -198,23 +222,21 @@ def show_main_app():
 def show_dashboard():
     st.header("📊 Dashboard")
     
-    todos = make_api_call("GET", "/todos") or []
-    
+    todos = fetch_todos(st.session_state.token) or []
+    total, completed, high_priority = todo_stats(todos)
+
     col1, col2, col3, col4 = st.columns(4)
-    
+
     with col1:
-        st.metric("Total TODOs", len(todos))
-    
+        st.metric("Total TODOs", total)
+
     with col2:
-        completed = sum(1 for t in todos if t.get('completed', False))
         st.metric("✅ Completed", completed)
-    
+
     with col3:
-        pending = len(todos) - completed
-        st.metric("⏳ Pending", pending)
-    
+        st.metric("⏳ Pending", total - completed)
+
     with col4:
-        high_priority = sum(1 for t in todos if t.get('priority', 3) == 1)
         st.metric("🔥 High Priority", high_priority)
     
     st.markdown("---")
@@ -222,7 +244,7 @@ def show_dashboard():
     # Recent TODOs
     if todos:
         st.subheader("📅 Recent TODOs")
-        recent = sorted(todos, key=lambda x: x.get('created_at', ''), reverse=True)[:5]
+        recent = heapq.nlargest(5, todos, key=lambda x: x.get('created_at', ''))
         for todo in recent:
             status = "✅" if todo.get('completed') else "⏳"
             st.write(f"{status} **{todo['title']}** (Priority: {todo.get('priority', 3)})")
@@ -268,6 +290,7 @@ def create_todo():
                 
                 result = make_api_call("POST", "/todos", todo_data)
                 if result:
+                    fetch_todos.clear()
                     st.success(f"✅ Created TODO #{result.get('id')}")
                     time.sleep(1)
                     st.rerun()
@@ -276,7 +299,7 @@ def create_todo():
 def list_todos():
     st.header("📋 My TODOs")
     
-    todos = make_api_call("GET", "/todos") or []
+    todos = fetch_todos(st.session_state.token) or []
     
     if todos:
         # Filters
@@ -286,15 +309,19 @@ def list_todos():
         with col2:
             priority_filter = st.selectbox("Priority", ["All", "1", "2", "3", "4", "5"])
         
-        # Apply filters
-        filtered = todos
+        # Apply both filters in a single pass instead of chained scans
+        want_completed = None
         if status_filter == "Completed":
-            filtered = [t for t in filtered if t.get('completed', False)]
+            want_completed = True
         elif status_filter == "Pending":
-            filtered = [t for t in filtered if not t.get('completed', False)]
-        
-        if priority_filter != "All":
-            filtered = [t for t in filtered if t.get('priority', 3) == int(priority_filter)]
+            want_completed = False
+        want_priority = None if priority_filter == "All" else int(priority_filter)
+
+        filtered = [
+            t for t in todos
+            if (want_completed is None or t.get('completed', False) == want_completed)
+            and (want_priority is None or t.get('priority', 3) == want_priority)
+        ]
         
         st.subheader(f"📊 Found {len(filtered)} TODOs")
         
@@ -318,7 +345,7 @@ def list_todos():
 def update_todo():
     st.header("✏️ Update TODO")
     
-    todos = make_api_call("GET", "/todos") or []
+    todos = fetch_todos(st.session_state.token) or []
     
     if not todos:
         st.info("No TODOs to update")
@@ -353,6 +380,7 @@ def update_todo():
                     
                     result = make_api_call("PUT", f"/todos/{todo_id}", update_data)
                     if result:
+                        fetch_todos.clear()
                         st.success("✅ Updated successfully!")
                         time.sleep(1)
                         st.rerun()
@@ -361,7 +389,7 @@ def update_todo():
 def toggle_todo():
     st.header("🔄 Toggle Status")
     
-    todos = make_api_call("GET", "/todos") or []
+    todos = fetch_todos(st.session_state.token) or []
     
     if not todos:
         st.info("No TODOs found")
@@ -378,6 +406,7 @@ def toggle_todo():
             if st.button(btn_text, key=f"toggle_{todo['id']}"):
                 result = make_api_call("PATCH", f"/todos/{todo['id']}/toggle")
                 if result:
+                    fetch_todos.clear()
                     st.success("Status updated!")
                     time.sleep(1)
                     st.rerun()
@@ -388,7 +417,7 @@ def toggle_todo():
 def delete_todo():
     st.header("❌ Delete TODO")
     
-    todos = make_api_call("GET", "/todos") or []
+    todos = fetch_todos(st.session_state.token) or []
     
     if not todos:
         st.info("No TODOs to delete")
@@ -410,6 +439,7 @@ def delete_todo():
                 if st.button("✅ Confirm Delete", type="primary"):
                     result = make_api_call("DELETE", f"/todos/{todo_id}")
                     if result:
+                        fetch_todos.clear()
                         st.success("✅ Deleted!")
                         time.sleep(1)
                         st.rerun()
@@ -422,7 +452,7 @@ def delete_todo():
 def show_profile():
     st.header("👤 Your Profile")
     
-    user_info = make_api_call("GET", "/me")
+    user_info = fetch_me(st.session_state.token)
     
     if user_info:
         col1, col2 = st.columns(2)
@@ -436,10 +466,9 @@ def show_profile():
         
         with col2:
             st.subheader("Statistics")
-            todos = make_api_call("GET", "/todos") or []
-            total = len(todos)
-            completed = sum(1 for t in todos if t.get('completed', False))
-            
+            todos = fetch_todos(st.session_state.token) or []
+            total, completed, _ = todo_stats(todos)
+
             st.metric("Total TODOs", total)
             st.metric("Completed", completed)
             st.metric("Pending", total - completed)